@@ -1,6 +1,6 @@
 #!/usr/bin/env python
 from __future__ import annotations
-import os, json, time, argparse, urllib.parse, logging
+import os, re, json, time, argparse, urllib.parse, logging
 from datetime import datetime, timezone
 from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
@@ -15,6 +15,9 @@ from agisdk.REAL.tasks import all_tasks as tasks
 from agisdk.REAL.browsergym.webclones.task_config import TaskConfig, DEFAULT_VERSION
 from agisdk.REAL.browsergym.webclones.evaluate     import WebCloneEvaluator
 
+# Outermost {...} span in a model reply that isn't bare JSON
+JSON_OBJECT_RE = re.compile(r'\{.*\}', re.DOTALL)
+
 def run_task(task: dict, run_id: str, model: Anthropic, 
              timeout_ms: int = 420000) -> dict:
     t0 = time.time()
@@ -74,8 +77,7 @@ def run_task(task: dict, run_id: str, model: Anthropic,
         try:
             env_state = json.loads(resp.text)
         except (json.JSONDecodeError, TypeError):
-            import re
-            json_match = re.search(r'\{.*\}', resp.text, re.DOTALL)
+            json_match = JSON_OBJECT_RE.search(resp.text)
             if json_match:
                 try:
                     env_state = json.loads(json_match.group())
@@ -139,18 +141,30 @@ def run_task(task: dict, run_id: str, model: Anthropic,
 def get_results_folder() -> Path:
     return Path("anthropic_cua_results")
 
+def write_json_atomic(path: Path, data: Dict[str, Any]) -> None:
+    # Write to a sibling temp file and rename over the target, so an interrupted
+    # run never leaves a truncated task file that load_existing_results can't parse
+    tmp_path = path.with_name(path.name + ".tmp")
+    with open(tmp_path, 'wb') as f:
+        f.write(json.dumps(data, indent=2).encode("utf-8"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
 def load_existing_results() -> Dict[str, Any]:
     results_folder = get_results_folder()
     existing_tasks = {}
     
     if results_folder.exists():
+        # Leftovers from a run interrupted mid-write; the previous task file (if any) is intact
+        for tmp_file in results_folder.glob("*.json.tmp"):
+            tmp_file.unlink(missing_ok=True)
         for task_file in results_folder.glob("task_*.json"):
             try:
-                with open(task_file, 'r') as f:
-                    task_data = json.load(f)
-                    task_id = task_data.get("task_id")
-                    if task_id:
-                        existing_tasks[task_id] = task_data
+                task_data = json.loads(task_file.read_bytes())
+                task_id = task_data.get("task_id")
+                if task_id:
+                    existing_tasks[task_id] = task_data
             except (json.JSONDecodeError, IOError) as e:
                 print(f"⚠️ Could not load task file {task_file}: {e}")
     
@@ -181,8 +195,7 @@ def save_task_result(task_result: Dict[str, Any], run_name: str) -> None:
         "goal": task_result.get("goal", ""),
     }
     
-    with open(task_file, 'w') as f:
-        json.dump(individual_task, f, indent=2)
+    write_json_atomic(task_file, individual_task)
     
     print(f"📄 Task {task_id} saved to: {task_file}")
 
@@ -207,8 +220,16 @@ def save_summary_results(all_results: Dict[str, Any], run_name: str) -> None:
     }
     
     summary_file = results_folder / "summary.json"
-    with open(summary_file, 'w') as f:
-        json.dump(summary, f, indent=2)
+    # Skip the rewrite only when everything but the timestamp matches what's on disk
+    try:
+        previous = json.loads(summary_file.read_bytes())
+        previous.pop("timestamp", None)
+        if previous == {k: v for k, v in summary.items() if k != "timestamp"}:
+            print(f"📊 Summary unchanged: {summary_file}")
+            return
+    except (json.JSONDecodeError, OSError, AttributeError):
+        pass
+    write_json_atomic(summary_file, summary)
     
     print(f"📊 Summary saved to: {summary_file}")
 
@@ -286,8 +307,7 @@ def main() -> None:
     
     if failed:
         print(f"Failed tasks: {len(failed)}")
-        for task in failed:
-            print(f"  - {task['task_id']}: {task.get('error', 'Unknown error')}")
+        print("\n".join(f"  - {task['task_id']}: {task.get('error', 'Unknown error')}" for task in failed))
     
     save_summary_results(existing_results, args.run_name)
 
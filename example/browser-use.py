@@ -6,6 +6,7 @@ from browser_use import Agent
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import asyncio
 import threading
+import traceback
 
 from agisdk.REAL.browsergym.webclones.task_config import TaskConfig, DEFAULT_VERSION
 from agisdk.REAL.browsergym.webclones.evaluate import WebCloneEvaluator
@@ -150,7 +151,6 @@ async def run_task(task: dict, run_id: str, llm_model) -> dict:
     except Exception as exc:
         result["error"] = str(exc)
         print(f"Error on task {tid}: {exc}")
-        import traceback
         traceback.print_exc()
     
     elapsed = time.time() - t0
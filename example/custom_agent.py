@@ -22,6 +22,9 @@ logger = logging.getLogger(__name__)
 def image_to_jpg_base64_url(image: np.ndarray | Image.Image) -> str:
     """Convert image to base64 encoded JPEG URL."""
     if isinstance(image, np.ndarray):
+        # drop alpha on the array (a view) rather than via a PIL RGBA -> RGB convert
+        if image.ndim == 3 and image.shape[-1] == 4:
+            image = image[..., :3]
         image = Image.fromarray(image)
     if image.mode in ("RGBA", "LA"):
         image = image.convert("RGB")
@@ -214,27 +217,28 @@ You will now think step by step and produce your next best action. Reflect on yo
         system_msgs = self._build_system_messages()
         user_msgs = self._build_user_messages(obs)
         
-        prompt_text_strings = []
-        for message in system_msgs + user_msgs:
-            match message["type"]:
-                case "text":
-                    prompt_text_strings.append(message["text"])
-                case "image_url":
-                    image_url = message["image_url"]
-                    if isinstance(message["image_url"], dict):
-                        image_url = image_url["url"]
-                    if image_url.startswith("data:image"):
-                        prompt_text_strings.append("image_url: " + image_url[:30] + "... (truncated)")
-                    else:
-                        prompt_text_strings.append("image_url: " + image_url)
-                case _:
-                    raise ValueError(f"Unknown message type {repr(message['type'])} in the task goal.")
-        
-        full_prompt_txt = "\n".join(prompt_text_strings)
-        logger.info(full_prompt_txt)
+        # Only render the text view of the prompt when it will actually be logged
+        if logger.isEnabledFor(logging.INFO):
+            prompt_text_strings = []
+            for message in system_msgs + user_msgs:
+                match message["type"]:
+                    case "text":
+                        prompt_text_strings.append(message["text"])
+                    case "image_url":
+                        image_url = message["image_url"]
+                        if isinstance(message["image_url"], dict):
+                            image_url = image_url["url"]
+                        if image_url.startswith("data:image"):
+                            prompt_text_strings.append("image_url: " + image_url[:30] + "... (truncated)")
+                        else:
+                            prompt_text_strings.append("image_url: " + image_url)
+                    case _:
+                        raise ValueError(f"Unknown message type {repr(message['type'])} in the task goal.")
+
+            logger.info("\n".join(prompt_text_strings))
         
         action = self._query_model(system_msgs, user_msgs)
-        logger.info(f"Action from query model: {action}")
+        logger.info("Action from query model: %s", action)
         self.action_history.append(action)
         
         return action, {}
@@ -8,11 +8,15 @@ import time
 from datetime import timedelta
 
 from agisdk import REAL
+from agisdk.REAL.browsergym.webclones.task_config import TASKS_BY_VERSION, DEFAULT_VERSION
 from agisdk.REAL.demo_agent.run_demo import str2bool
 from custom_agent import DemoAgentArgs  # Import from separate module to allow Ray pickling
 
 logger = logging.getLogger(__name__)
 
+# Task types in the version the harness runs (e.g. "omnizon" from "omnizon-1"), used to reject bad --task_type early
+TASK_TYPES = sorted({name.rsplit("-", 1)[0] for name in TASKS_BY_VERSION[DEFAULT_VERSION]})
+
 
 def run_demo_agent(model_name="gpt-4o", task_type=None, task_name=None, headless=False, leaderboard=False, run_id=None, workers=1, results_dir="./results"):
     """Run a test with the DemoAgent on a browsergym task."""
@@ -69,9 +73,10 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description="Run DemoAgent on browsergym tasks")
     parser.add_argument("--model", type=str, default="gpt-4o",
                         help="Model to use with the agent (default: gpt-4o)")
-    parser.add_argument("--task_type", type=str, default=None, help="Task to run (default: None, run all tasks)")
+    parser.add_argument("--task_type", type=str.lower, choices=TASK_TYPES, default=None,
+                        help="Task to run (default: None, run all tasks)")
     
-    parser.add_argument("--task_name", type=str, default=None, help="Task name to run (default: None, run all tasks)")
+    parser.add_argument("--task_name", type=str.strip, default=None, help="Task name to run (default: None, run all tasks)")
     parser.add_argument("--headless", type=str2bool, default=False,
                         help="Run headless (default: False - browser visible)")
     parser.add_argument("--run_id", type=str, default=None,
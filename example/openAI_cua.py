@@ -13,7 +13,7 @@ from pathlib import Path
 
 import requests
 from openai import OpenAI, OpenAIError
-from playwright.sync_api import sync_playwright, Error as PlaywrightError
+from playwright.sync_api import sync_playwright, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
 
 from agisdk.REAL.tasks import all_tasks as tasks
 from agisdk.REAL.browsergym.webclones.evaluate import WebCloneEvaluator
@@ -22,6 +22,35 @@ from agisdk.REAL.logging import logger as rich_logger
 
 
 
+# CUA key names -> Playwright key names
+KEY_MAPPING = {
+    "HOME": "Home",
+    "END": "End",
+    "PAGE_UP": "PageUp",
+    "PAGEUP": "PageUp",
+    "PAGE_DOWN": "PageDown",
+    "PAGEDOWN": "PageDown",
+    "ARROW_UP": "ArrowUp",
+    "ARROWUP": "ArrowUp",
+    "ARROW_DOWN": "ArrowDown",
+    "ARROWDOWN": "ArrowDown",
+    "ARROW_LEFT": "ArrowLeft",
+    "ARROWLEFT": "ArrowLeft",
+    "ARROW_RIGHT": "ArrowRight",
+    "ARROWRIGHT": "ArrowRight",
+    "ENTER": "Enter",
+    "ESCAPE": "Escape",
+    "ESC": "Escape",
+    "TAB": "Tab",
+    "SPACE": "Space",
+    "BACKSPACE": "Backspace",
+    "DELETE": "Delete",
+    "CTRL": "Control",
+    "ALT": "Alt",
+    "SHIFT": "Shift",
+    "META": "Meta",
+    "CMD": "Meta"
+}
 
 
 
@@ -34,8 +63,9 @@ class PlaywrightComputer:
         self.page = self.ctx.new_page()
 
 
-    def screenshot_b64(self) -> str:
-        return base64.b64encode(self.page.screenshot(full_page=False)).decode()
+    def screenshot_b64(self, quality: int = 80) -> str:
+        # JPEG is encoded by the browser and is several times smaller than the default PNG
+        return base64.b64encode(self.page.screenshot(full_page=False, type="jpeg", quality=quality)).decode()
 
     def _clamp(self, x: float, y: float):
         return max(0, min(x, self.w - 1)), max(0, min(y, self.h - 1))
@@ -57,37 +87,7 @@ class PlaywrightComputer:
         self.page.keyboard.type(text, delay=delay)
 
     def keypress(self, keys: List[str]):
-
-        key_mapping = {
-            "HOME": "Home",
-            "END": "End",
-            "PAGE_UP": "PageUp",
-            "PAGEUP": "PageUp",
-            "PAGE_DOWN": "PageDown",
-            "PAGEDOWN": "PageDown",
-            "ARROW_UP": "ArrowUp",
-            "ARROWUP": "ArrowUp",
-            "ARROW_DOWN": "ArrowDown",
-            "ARROWDOWN": "ArrowDown",
-            "ARROW_LEFT": "ArrowLeft",
-            "ARROWLEFT": "ArrowLeft",
-            "ARROW_RIGHT": "ArrowRight",
-            "ARROWRIGHT": "ArrowRight",
-            "ENTER": "Enter",
-            "ESCAPE": "Escape",
-            "ESC": "Escape",
-            "TAB": "Tab",
-            "SPACE": "Space",
-            "BACKSPACE": "Backspace",
-            "DELETE": "Delete",
-            "CTRL": "Control",
-            "ALT": "Alt",
-            "SHIFT": "Shift",
-            "META": "Meta",
-            "CMD": "Meta"
-        }
-
-        mapped_keys = [key_mapping.get(key, key) for key in keys]
+        mapped_keys = [KEY_MAPPING.get(key, key) for key in keys]
         self.page.keyboard.press("+".join(mapped_keys))
 
     def wait(self, ms: int):
@@ -130,6 +130,15 @@ HEIGHT = 768
 ITER_LIMIT = 120
 TIME_LIMIT = 800
 
+TOOLS = [
+    {
+        "type": "computer_use_preview",
+        "display_width": WIDTH,
+        "display_height": HEIGHT,
+        "environment": "browser",
+    }
+]
+
 client = OpenAI()
 
 
@@ -185,7 +194,7 @@ def run_task(task: Dict[str, Any], run_id: str, headless: bool) -> Dict[str, Any
                                 "type": "computer_call_output",
                                 "output": {
                                     "type": "input_image",
-                                    "image_url": f"data:image/png;base64,{screenshot_b64}",
+                                    "image_url": f"data:image/jpeg;base64,{screenshot_b64}",
                                 },
                                 **({"acknowledged_safety_checks": pending_safety} if pending_safety else {}),
                             }
@@ -199,14 +208,7 @@ def run_task(task: Dict[str, Any], run_id: str, headless: bool) -> Dict[str, Any
                     resp = client.responses.create(
                         model=MODEL,
                         previous_response_id=prev_id,
-                        tools=[
-                            {
-                                "type": "computer_use_preview",
-                                "display_width": WIDTH,
-                                "display_height": HEIGHT,
-                                "environment": "browser",
-                            }
-                        ],
+                        tools=TOOLS,
                         input=input_payload,
                         truncation="auto",
                     )
@@ -330,7 +332,9 @@ def run_task(task: Dict[str, Any], run_id: str, headless: bool) -> Dict[str, Any
             try:
                 rich_logger.info(f"🌐 Navigating to {finish_url} to extract final state...")
                 comp.goto(finish_url)
-                comp.wait(2000)
+                # Continue as soon as the state dump renders instead of always sleeping 2s
+                with suppress(PlaywrightTimeoutError):
+                    comp.page.wait_for_selector("pre", timeout=2000)
                 with suppress(PlaywrightError, json.JSONDecodeError):
                     pre = comp.page.query_selector("pre")
                     if pre:
@@ -400,55 +404,53 @@ def save_results_to_file(results: List[Dict[str, Any]], run_dir: Path, run_name:
         "success_rate": len(successful_tasks) / len(results) * 100 if results else 0,
         "avg_time": sum(r["elapsed_time"] for r in results) / len(results) if results else 0,
         "total_time": sum(r["elapsed_time"] for r in results),
-        "tasks": results
     }
 
 
+    # The task list is attached by reference; it is not copied into a second summary dict
     results_file = run_dir / "results.json"
     with open(results_file, 'w') as f:
-        json.dump(summary, f, indent=2)
+        f.write(json.dumps({**summary, "tasks": results}, indent=2))
 
     rich_logger.info(f"📁 Results saved to: {results_file}")
 
 
     summary_file = run_dir / "summary.json"
-    summary_only = {k: v for k, v in summary.items() if k != "tasks"}
     with open(summary_file, 'w') as f:
-        json.dump(summary_only, f, indent=2)
+        f.write(json.dumps(summary, indent=2))
 
+    rich_logger.info(f"📁 Individual task files saved to: {run_dir / 'tasks'}")
 
+def save_task_result(task_result: Dict[str, Any], run_dir: Path, run_name: str) -> None:
     tasks_dir = run_dir / "tasks"
     tasks_dir.mkdir(exist_ok=True)
 
-    for task_result in results:
-        task_id = task_result.get("task_id", "unknown")
-        task_file = tasks_dir / f"task_{task_id}.json"
+    task_id = task_result.get("task_id", "unknown")
+    task_file = tasks_dir / f"task_{task_id}.json"
 
 
-        individual_task = {
-            "task_id": task_id,
-            "run_name": run_name,
-            "timestamp": task_result.get("start_time", datetime.now(timezone.utc).isoformat()),
-            "model": "OpenAI-CUA",
-            "success": task_result.get("success", False),
-            "reward": task_result.get("reward", 0),
-            "elapsed_time": task_result.get("elapsed_time", 0),
-            "iterations": task_result.get("iterations", 0),
-            "actions_taken": task_result.get("actions_taken", []),
-            "env_state": task_result.get("env_state", {}),
-            "model_response": task_result.get("response", ""),
-            "eval_message": task_result.get("eval_message", ""),
-            "error": task_result.get("error"),
-            "start_time": task_result.get("start_time"),
-            "end_time": task_result.get("end_time"),
-        }
-
-        with open(task_file, 'w') as f:
-            json.dump(individual_task, f, indent=2)
+    individual_task = {
+        "task_id": task_id,
+        "run_name": run_name,
+        "timestamp": task_result.get("start_time", datetime.now(timezone.utc).isoformat()),
+        "model": "OpenAI-CUA",
+        "success": task_result.get("success", False),
+        "reward": task_result.get("reward", 0),
+        "elapsed_time": task_result.get("elapsed_time", 0),
+        "iterations": task_result.get("iterations", 0),
+        "actions_taken": task_result.get("actions_taken", []),
+        "env_state": task_result.get("env_state", {}),
+        "model_response": task_result.get("response", ""),
+        "eval_message": task_result.get("eval_message", ""),
+        "error": task_result.get("error"),
+        "start_time": task_result.get("start_time"),
+        "end_time": task_result.get("end_time"),
+    }
 
-        rich_logger.info(f"📄 Task {task_id} saved to: {task_file}")
+    with open(task_file, 'w') as f:
+        f.write(json.dumps(individual_task, indent=2))
 
-    rich_logger.info(f"📁 Individual task files saved to: {tasks_dir}")
+    rich_logger.info(f"📄 Task {task_id} saved to: {task_file}")
 
 def main() -> None:
     ts = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
@@ -482,7 +484,8 @@ def main() -> None:
             result = f.result()
             results.append(result)
 
-            save_results_to_file(results, run_dir, args.run_name)
+            # Only the finished task is written here; the aggregate files are written once below
+            save_task_result(result, run_dir, args.run_name)
 
 
     successful = [r for r in results if r.get("success", False)]
@@ -666,9 +666,12 @@ def _save_summary_info(
         summary_info["terminated"] = episode_info[-1].terminated
         summary_info["truncated"] = episode_info[-1].truncated
 
-    # Write updated summary info
-    with open(summary_info_path, "w") as f:
+    # Write updated summary info via a temp file, so that concurrent cache scans
+    # never read a truncated file
+    tmp_path = summary_info_path.with_name(summary_info_path.name + ".tmp")
+    with open(tmp_path, "w") as f:
         json.dump(summary_info, f, indent=4)
+    os.replace(tmp_path, summary_info_path)
 
 
 def _is_debugging():
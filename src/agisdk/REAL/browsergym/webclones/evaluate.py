@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Dict, Any, List
 from agisdk.REAL.browsergym.webclones.utils import generate_from_model
 from agisdk.REAL.logging import logger as rich_logger
@@ -9,6 +10,27 @@ import os
 import sys
 from pathlib import Path
 
+# Grades repeat across retries and samples of the same task. Only successfully parsed
+# grades are memoized; lru_cache doesn't cache exceptions, so a bad reply is retried.
+@lru_cache(maxsize=4096)
+def _llm_similarity(model: str, model_response: str, rubric: str) -> float:
+    fuzzy_match_prompt = f"""
+        Given a student's answer and a rubric, help a teacher grade the answer. Keep in mind
+        that the student may use different words or phrases to express the same idea.
+
+        Student's answer: {model_response}
+        Rubric: {rubric}
+
+        Grade the student's answer on a scale of 0 to 1, where 1 means the student's answer matches the rubric. Don't be too strict.
+        Please answer only with a floating point number and nothing else.
+    """
+    llm_grade = generate_from_model(prompt=fuzzy_match_prompt, model=model)
+    try:
+        return float(llm_grade)
+    except ValueError:
+        raise ValueError(f"LLM response is not a valid floating point number: {llm_grade}")
+
+
 class WebCloneEvaluator:
     def __init__(self, task_config: Dict[str, Any], llm: str = "gpt-4.1"):
         """
@@ -71,22 +93,7 @@ class WebCloneEvaluator:
 
     def evaluate_with_llm(self, model_response: str, rubric: str, threshold: float = 0.8):
         """Performs fuzzy matching using an LLM."""
-        fuzzy_match_prompt = f"""
-            Given a student's answer and a rubric, help a teacher grade the answer. Keep in mind
-            that the student may use different words or phrases to express the same idea.
-
-            Student's answer: {model_response}
-            Rubric: {rubric}
-
-            Grade the student's answer on a scale of 0 to 1, where 1 means the student's answer matches the rubric. Don't be too strict.
-            Please answer only with a floating point number and nothing else.
-        """
-        llm_grade = generate_from_model(prompt=fuzzy_match_prompt, model=self.llm)
-        try:
-            similarity = float(llm_grade)
-        except ValueError:
-            similarity = 0.0
-            raise ValueError(f"LLM response is not a valid floating point number: {llm_grade}")
+        similarity = _llm_similarity(self.llm, model_response, rubric)
         is_correct = similarity > threshold
         info = {"similarity": similarity, "model_response": model_response, "rubric": rubric}
         return is_correct, info
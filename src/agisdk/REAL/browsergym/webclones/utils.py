@@ -1,5 +1,6 @@
+from functools import lru_cache
+
 from openai import OpenAI
-import os
 
 async def scrape_content(page):
     # Evaluate JavaScript to extract the content inside the <pre> tag within the #__next div
@@ -11,10 +12,13 @@ async def scrape_content(page):
 
     print(content)
 
+@lru_cache(maxsize=1)
+def _get_client() -> OpenAI:
+    # created on first use so importing the evaluator doesn't require OPENAI_API_KEY
+    return OpenAI()
+
 def generate_from_model(model: str = "gpt4o", prompt: str = ""):
-    client = OpenAI()
-    openai_api_key = os.getenv("OPENAI_API_KEY")
-    response = client.chat.completions.create(
+    response = _get_client().chat.completions.create(
         model=model,
         messages=[{"role": "user", "content": prompt}],
     )
@@ -3,6 +3,7 @@ import dataclasses
 import numpy as np
 import io
 import logging
+import os
 import time
 
 from PIL import Image
@@ -21,6 +22,9 @@ def image_to_jpg_base64_url(image: np.ndarray | Image.Image):
     """Convert a numpy array to a base64 encoded image url."""
 
     if isinstance(image, np.ndarray):
+        # drop alpha on the array (a view) rather than via a PIL RGBA -> RGB convert
+        if image.ndim == 3 and image.shape[-1] == 4:
+            image = image[..., :3]
         image = Image.fromarray(image)
     if image.mode in ("RGBA", "LA"):
         image = image.convert("RGB")
@@ -100,7 +104,6 @@ class DemoAgent(Agent):
 
         from openai import OpenAI
         from anthropic import Anthropic
-        import os
         import httpx
 
         if model_name.startswith("gpt-") or model_name.startswith("o1") or model_name.startswith("o3"):
@@ -352,7 +355,7 @@ class DemoAgent(Agent):
                 response = self.client.messages.create(**create_params)
                 
                 # Log response content types for debugging
-                logger.info(f"Response content types: {[content.type for content in response.content]}")
+                logger.info("Response content types: %s", [content.type for content in response.content])
                 
                 # Extract text content, handling all block types properly
                 text_content = None
@@ -362,7 +365,7 @@ class DemoAgent(Agent):
                         break
                     elif content_block.type == "thinking":
                         # Log thinking content for debugging but don't return it
-                        logger.debug(f"Thinking block: {content_block.thinking[:100]}...")
+                        logger.debug("Thinking block: %.100s...", content_block.thinking)
                     elif content_block.type == "redacted_thinking":
                         # Log that we encountered redacted thinking
                         logger.debug("Encountered redacted thinking block")
@@ -390,6 +393,18 @@ class DemoAgent(Agent):
         self.action_history = []
         self.last_observation = None
 
+        # last encoded screenshot, reused while the page doesn't change
+        self._last_screenshot = None
+        self._last_screenshot_url = None
+
+    def _screenshot_url(self, screenshot: np.ndarray) -> str:
+        """Encode the screenshot, reusing the previous step's URL if the frame is unchanged."""
+        if self._last_screenshot is not None and np.array_equal(screenshot, self._last_screenshot):
+            return self._last_screenshot_url
+        self._last_screenshot = screenshot
+        self._last_screenshot_url = image_to_jpg_base64_url(screenshot)
+        return self._last_screenshot_url
+
     def get_action(self, obs: dict) -> tuple[str, dict]:
         # Print task start information if this is the first action
         if len(self.action_history) == 0:
@@ -513,7 +528,7 @@ class DemoAgent(Agent):
                 {
                     "type": "image_url",
                     "image_url": {
-                        "url": image_to_jpg_base64_url(obs["screenshot"]),
+                        "url": self._screenshot_url(obs["screenshot"]),
                         "detail": "auto",
                     },  # Literal["low", "high", "auto"] = "auto"
                 }
@@ -591,28 +606,29 @@ class DemoAgent(Agent):
             }
         )
 
-        prompt_text_strings = []
-        for message in system_msgs + user_msgs:
-            match message["type"]:
-                case "text":
-                    prompt_text_strings.append(message["text"])
-                case "image_url":
-                    image_url = message["image_url"]
-                    if isinstance(message["image_url"], dict):
-                        image_url = image_url["url"]
-                    if image_url.startswith("data:image"):
-                        prompt_text_strings.append(
-                            "image_url: " + image_url[:30] + "... (truncated)"
+        # The text rendering of the prompt is only used for debug logging; the full
+        # prompt is too verbose for info, so skip building it otherwise
+        if logger.isEnabledFor(logging.DEBUG):
+            prompt_text_strings = []
+            for message in system_msgs + user_msgs:
+                match message["type"]:
+                    case "text":
+                        prompt_text_strings.append(message["text"])
+                    case "image_url":
+                        image_url = message["image_url"]
+                        if isinstance(message["image_url"], dict):
+                            image_url = image_url["url"]
+                        if image_url.startswith("data:image"):
+                            prompt_text_strings.append(
+                                "image_url: " + image_url[:30] + "... (truncated)"
+                            )
+                        else:
+                            prompt_text_strings.append("image_url: " + image_url)
+                    case _:
+                        raise ValueError(
+                            f"Unknown message type {repr(message['type'])} in the task goal."
                         )
-                    else:
-                        prompt_text_strings.append("image_url: " + image_url)
-                case _:
-                    raise ValueError(
-                        f"Unknown message type {repr(message['type'])} in the task goal."
-                    )
-        full_prompt_txt = "\n".join(prompt_text_strings)
-        # Don't log the full prompt - too verbose
-        # logger.info(full_prompt_txt)
+            logger.debug("\n".join(prompt_text_strings))
 
         # query model using the abstraction function
         action = self.query_model(system_msgs, user_msgs)
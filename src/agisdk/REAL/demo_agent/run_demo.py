@@ -7,12 +7,17 @@ from agisdk.REAL.browsergym.experiments import EnvArgs, ExpArgs, get_exp_result
 from .basic_agent import DemoAgentArgs
 
 
+_TRUE_STRINGS = frozenset({"yes", "true", "t", "y", "1"})
+_FALSE_STRINGS = frozenset({"no", "false", "f", "n", "0"})
+
+
 def str2bool(v):
     if isinstance(v, bool):
         return v
-    if v.lower() in ("yes", "true", "t", "y", "1"):
+    v = v.lower()
+    if v in _TRUE_STRINGS:
         return True
-    elif v.lower() in ("no", "false", "f", "n", "0"):
+    elif v in _FALSE_STRINGS:
         return False
     else:
         raise argparse.ArgumentTypeError("Boolean value expected.")
@@ -116,8 +121,7 @@ https://github.com/ServiceNow/AgentLab"""
     exp_result = get_exp_result(exp_args.exp_dir)
     exp_record = exp_result.get_exp_record()
 
-    for key, val in exp_record.items():
-        print(f"{key}: {val}")
+    print("\n".join(f"{key}: {val}" for key, val in exp_record.items()))
 
 
 if __name__ == "__main__":
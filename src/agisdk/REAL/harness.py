@@ -5,15 +5,20 @@ Provides a clean, simple interface for running both built-in and custom agents.
 """
 
 import os
+import re
 import glob
 import random
 import json
 import time
 import uuid
 import logging
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from typing import List, Dict, Optional, Any, Tuple
 from pathlib import Path
-from statistics import mean, median, stdev
+from statistics import mean
+
+import numpy as np
 
 # Rich logging support
 from agisdk.REAL.logging import logger as rich_logger
@@ -93,9 +98,11 @@ if RAY_AVAILABLE:
             "run_uuid": run_uuid,
         }
         
-        # Write initial summary info
-        with open(summary_info_path, "w") as f:
+        # Write initial summary info via a temp file so cache scans never see a partial file
+        tmp_path = summary_info_path.with_name(summary_info_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
             json.dump(initial_summary, f, indent=4)
+        os.replace(tmp_path, summary_info_path)
         
         # Run the experiment
         exp_args.run()
@@ -127,6 +134,35 @@ if RAY_AVAILABLE:
 
 logger = logging.getLogger(__name__)
 
+# Task type is everything before the first "-<digit>" (e.g. "fly-unified" from "fly-unified-3")
+_TASK_TYPE_RE = re.compile(r"^(.+?)-\d")
+
+
+def _extract_task_type(task_name: str) -> str:
+    """Extract the task type from a task name, with or without a version prefix."""
+    task_full_name = task_name.split('.')[1] if '.' in task_name else task_name
+    match = _TASK_TYPE_RE.match(task_full_name)
+    return match.group(1) if match else task_full_name.split('-')[0]
+
+
+# The task definitions ship with the package and don't change while the process
+# runs, so directory listings and "possible" flags are memoized across calls
+@lru_cache(maxsize=None)
+def _list_task_files(tasks_dir: Path) -> Tuple[Path, ...]:
+    """List the task definition files in a tasks directory, sorted by name."""
+    return tuple(sorted(tasks_dir.glob("*.json")))
+
+
+@lru_cache(maxsize=None)
+def _is_possible_task(path: Path) -> bool:
+    """Whether a task definition is marked possible (unparseable files count as not)."""
+    try:
+        with path.open("r", encoding="utf-8") as file:
+            task_data = json.load(file)
+    except json.JSONDecodeError:
+        return False
+    return task_data.get("possible", True)
+
 class harness:
     """
     A simplified harness for running browsergym tasks with various agents.
@@ -246,11 +282,14 @@ class harness:
             "task_seed": None,
             "max_steps": max_steps,
             "headless": headless,
-            "golden_user_data_dir": golden_user_data_dir,
-            "extensions_dir": extensions_dir,
             "viewport": viewport,
         }
-        
+        # Optional browser settings are only passed through when set; EnvArgs defaults them to None
+        if golden_user_data_dir is not None:
+            self.env_args["golden_user_data_dir"] = golden_user_data_dir
+        if extensions_dir is not None:
+            self.env_args["extensions_dir"] = extensions_dir
+
         # Try to get run_id from API if api_key and run_name are provided but run_id is not
         if not run_id and api_key and run_name:
             # Use model_id_name if provided, otherwise use model
@@ -297,8 +336,7 @@ class harness:
         self.task_id = task_id
         
         # Create default results directory if it doesn't exist
-        if not os.path.exists(results_dir):
-            os.makedirs(results_dir)
+        os.makedirs(results_dir, exist_ok=True)
     
     def run(self, tasks: List[str] = None) -> Dict[str, Any]:
         """
@@ -316,7 +354,7 @@ class harness:
 
         # Determine which tasks to run if not explicitly provided
         if tasks is None:
-            if self.task_name:
+            if self.task_name is not None:
                 # Run a specific task
                 tasks = [self.task_name]
             else:
@@ -355,71 +393,58 @@ class harness:
             rich_logger.warning("No results to display.")
             return
         
-        # Calculate aggregate score
-        success_count = sum(1 for _, r in results.items() if r.get('cum_reward', 0) == 1)
+        # Calculate aggregate score, timing statistics and per-task-type
+        # breakdown in a single pass
+        all_times = []
+        successful_times = []
+        task_type_results = {}
+        for task_name, record in results.items():
+            elapsed_time = record.get('elapsed_time', 0)
+            success = record.get('cum_reward', 0) == 1
+            all_times.append(elapsed_time)
+            if success:
+                successful_times.append(elapsed_time)
+            
+            # Group by task type (e.g., "omnizon" from "v2.omnizon-1")
+            stats = task_type_results.setdefault(
+                _extract_task_type(task_name),
+                {'total': 0, 'success': 0, 'times': []}
+            )
+            stats['total'] += 1
+            stats['times'].append(elapsed_time)
+            if success:
+                stats['success'] += 1
+        success_count = len(successful_times)
         success_rate = success_count / len(results) * 100
         
-        # Collect timing statistics
-        all_times = [r.get('elapsed_time', 0) for _, r in results.items()]
-        successful_times = [r.get('elapsed_time', 0) for _, r in results.items() if r.get('cum_reward', 0) == 1]
-        
         rich_logger.success("BENCHMARK RESULTS")
         rich_logger.info(f"Tasks completed successfully: {success_count}/{len(results)}")
         rich_logger.info(f"Success rate: {success_rate:.2f}%")
         
         # Print timing statistics
-        if all_times:
-            rich_logger.header("Timing Statistics")
-            rich_logger.info(f"Average time: {mean(all_times):.2f} seconds")
-            rich_logger.info(f"Median time: {median(all_times):.2f} seconds")
-            rich_logger.info(f"Min time: {min(all_times):.2f} seconds")
-            rich_logger.info(f"Max time: {max(all_times):.2f} seconds")
-            if len(all_times) > 1:
-                rich_logger.info(f"Std deviation: {stdev(all_times):.2f} seconds")
-        
-        if successful_times:
-            rich_logger.header("Timing Statistics (Successful Tasks Only)")
-            rich_logger.info(f"Average time: {mean(successful_times):.2f} seconds")
-            rich_logger.info(f"Median time: {median(successful_times):.2f} seconds")
-            rich_logger.info(f"Min time: {min(successful_times):.2f} seconds")
-            rich_logger.info(f"Max time: {max(successful_times):.2f} seconds")
-            if len(successful_times) > 1:
-                rich_logger.info(f"Std deviation: {stdev(successful_times):.2f} seconds")
-        
-        # Group results by task type
-        task_type_results = {}
-        for task_name, record in results.items():
-            # Extract task type (e.g., "omnizon" from "v2.omnizon-1")
-            task_full_name = task_name.split('.')[1] if '.' in task_name else task_name
-            parts = task_full_name.split('-')
-            
-            # Find where the numeric part starts
-            for i, part in enumerate(parts[1:], 1):
-                if part and part[0].isdigit():
-                    task_type = '-'.join(parts[:i])
-                    break
-            else:
-                # Fallback if no numeric part is found
-                task_type = parts[0]
-            
-            if task_type not in task_type_results:
-                task_type_results[task_type] = {
-                    'total': 0,
-                    'success': 0,
-                    'times': []
-                }
-            
-            task_type_results[task_type]['total'] += 1
-            task_type_results[task_type]['times'].append(record.get('elapsed_time', 0))
-            if record.get('cum_reward', 0) == 1:
-                task_type_results[task_type]['success'] += 1
+        for header, times in (
+            ("Timing Statistics", all_times),
+            ("Timing Statistics (Successful Tasks Only)", successful_times),
+        ):
+            if not times:
+                continue
+            times = np.asarray(times, dtype=float)
+            rich_logger.header(header)
+            rich_logger.info(f"Average time: {times.mean():.2f} seconds")
+            rich_logger.info(f"Median time: {np.median(times):.2f} seconds")
+            rich_logger.info(f"Min time: {times.min():.2f} seconds")
+            rich_logger.info(f"Max time: {times.max():.2f} seconds")
+            if len(times) > 1:
+                rich_logger.info(f"Std deviation: {times.std(ddof=1):.2f} seconds")
         
         # Print results by task type
         print("\nResults by task type:")
-        for task_type, stats in sorted(task_type_results.items()):
-            success_rate = (stats['success'] / stats['total']) * 100
-            avg_time = mean(stats['times']) if stats['times'] else 0
-            print(f"  {task_type}: {stats['success']}/{stats['total']} ({success_rate:.2f}%) - Avg time: {avg_time:.2f}s")
+        print("\n".join(
+            f"  {task_type}: {stats['success']}/{stats['total']} "
+            f"({stats['success'] / stats['total'] * 100:.2f}%) - "
+            f"Avg time: {mean(stats['times']) if stats['times'] else 0:.2f}s"
+            for task_type, stats in sorted(task_type_results.items())
+        ))
     
     def _get_tasks(
         self,
@@ -449,28 +474,17 @@ class harness:
             raise ValueError(f"Unknown task version '{version}'")
 
         tasks_dir = Path(WEBCLONE_VERSION_DIRS[version]) / "tasks"
-        json_files = sorted(tasks_dir.glob("*.json"))
-
-        filtered_paths = []
-        for path in json_files:
-            if include_impossible:
-                filtered_paths.append(path)
-                continue
-            try:
-                with path.open("r", encoding="utf-8") as file:
-                    task_data = json.load(file)
-                if task_data.get("possible", True):
-                    filtered_paths.append(path)
-            except json.JSONDecodeError:
-                continue
-
-        task_names = [p.stem for p in filtered_paths]
+        json_files = _list_task_files(tasks_dir)
 
+        # Filter by name first so only candidate task files are opened
         if task_type:
-            task_names = [
-                name for name in task_names
-                if name.startswith(f"{task_type}-")
-            ]
+            prefix = f"{task_type}-"
+            json_files = [path for path in json_files if path.stem.startswith(prefix)]
+
+        task_names = [
+            path.stem for path in json_files
+            if include_impossible or _is_possible_task(path)
+        ]
 
         if task_type and task_id is not None:
             specific_task = f"{task_type}-{task_id}"
@@ -480,8 +494,9 @@ class harness:
             raise ValueError(f"Task {specific_task} not found in version {version}")
 
         if sample_size is not None and sample_size > 0 and sample_size < len(task_names):
-            random.seed(random_seed)
-            task_names = random.sample(task_names, sample_size)
+            # A private generator keeps the global random state untouched; it draws
+            # the same sample as seeding the module-level generator would
+            task_names = random.Random(random_seed).sample(task_names, sample_size)
 
         return [
             f"{version}.{name}"
@@ -543,9 +558,6 @@ class harness:
             Dictionary of results indexed by task name
         """
         # Generate a unique run ID for this batch (but potentially override with cached run_id for leaderboard)
-        import uuid
-        
-        # Initialize with a new UUID
         run_uuid = str(uuid.uuid4())
         
         
@@ -562,11 +574,22 @@ class harness:
 
         '''
         # Check if there's a consistent run_id we should use from the cache for leaderboard submissions
+        # Scan the results directory once; both the run_id check and the
+        # per-task lookups below are served from this index
+        cache_index = None
+        if use_cache and not force_refresh:
+            cache_index = self._build_cache_index(results_dir)
+            # The agent/env part of the cache key is the same for every task
+            cache_key_suffix = self._cache_key_suffix(agent_args, env_args_dict)
+        
         cached_run_id = None
-        if self.leaderboard and use_cache and not force_refresh:
+        if self.leaderboard and cache_index is not None:
             # Try to find a cached leaderboard result to extract its run_id
             for task_name in tasks[:1]:  # Just check one task to determine the run_id
-                cached_result = self._find_cached_result(task_name, agent_args, env_args_dict, results_dir)
+                cached_result = self._find_cached_result(
+                    task_name, agent_args, env_args_dict, results_dir,
+                    cache_index=cache_index, cache_key_suffix=cache_key_suffix
+                )
                 if cached_result and cached_result.get("leaderboard", False):
                     cached_run_id = cached_result.get("run_uuid")
                     if cached_run_id:
@@ -576,14 +599,13 @@ class harness:
         
         # If this is a leaderboard run, set the RUNID environment variable
         if self.leaderboard:
-            if hasattr(self, "run_id") and self.run_id:
+            if self.run_id:
                 # If harness was initialized with a specific run_id, use that instead
                 run_uuid = self.run_id
                 print(f"Using explicitly provided run_id: {run_uuid}")
             logger.info(f"Setting RUNID environment variable to {run_uuid} for leaderboard submission")
             os.environ["RUNID"] = run_uuid
         # Store run metadata for tracking
-        import time
         run_timestamp = time.time()
         run_metadata = {
             "run_uuid": run_uuid,
@@ -591,20 +613,26 @@ class harness:
             "agent_type": agent_args.agent_name if hasattr(agent_args, "agent_name") else type(agent_args).__name__,
             "model_name": getattr(agent_args, "model_name", "unknown"),
             "total_tasks": len(tasks),
-            "leaderboard": self.leaderboard if hasattr(self, "leaderboard") else False
+            "leaderboard": self.leaderboard
         }
         rich_logger.info(f"🆔 Starting run with ID: {run_uuid}")
         
         # Initialize results dictionary
         results = {}
         
+        # Records of the experiments executed by this run (not served from cache)
+        new_records = []
+        
         # Determine which tasks need to be run
         tasks_to_run = []
         
-        if use_cache and not force_refresh:
+        if cache_index is not None:
             for task_name in tasks:
                 # Try to find a cached result
-                cached_result = self._find_cached_result(task_name, agent_args, env_args_dict, results_dir)
+                cached_result = self._find_cached_result(
+                    task_name, agent_args, env_args_dict, results_dir,
+                    cache_index=cache_index, cache_key_suffix=cache_key_suffix
+                )
                 
                 if cached_result:
                     # Use cached result
@@ -635,6 +663,10 @@ class harness:
                         resources={"memory_gb": num_workers}
                     )
                 
+                # Start the longest tasks first so they don't end up as stragglers
+                if cache_index:
+                    tasks_to_run = self._order_longest_first(tasks_to_run, cache_index)
+                
                 # Submit all tasks as futures - Ray will queue them based on memory_gb availability
                 ray_futures = [
                     run_task_ray.remote(
@@ -649,12 +681,15 @@ class harness:
                     for task_name in tasks_to_run
                 ]
                 
-                # Get results from Ray workers
-                ray_results = ray.get(ray_futures)
-                new_results = dict(ray_results)
-                
-                # Merge with cached results
-                results.update(new_results)
+                # Merge each worker's (task_name, record) pair as soon as it finishes,
+                # rather than blocking until the whole batch is done
+                pending = ray_futures
+                while pending:
+                    done, pending = ray.wait(pending, num_returns=1)
+                    task_name, exp_record = ray.get(done[0])
+                    results[task_name] = exp_record
+                    new_records.append(exp_record)
+                    rich_logger.info(f"📊 Progress: {len(new_records)}/{len(ray_futures)} tasks finished ({task_name})")
             else:
                 # Run tasks sequentially
                 for task_name in tasks_to_run:
@@ -668,40 +703,65 @@ class harness:
                         run_uuid=run_uuid
                     )
                     results[task_name] = exp_record
+                    new_records.append(exp_record)
         
         # Gather statistics for this run using the run_uuid
         cache_hits = len(tasks) - len(tasks_to_run)
         
-        # Find all experiments with this run_uuid to count errors
-        exps_with_errors = 0
-        total_exps = 0
-        
-        for exp_dir in self._find_experiment_dirs(results_dir):
-            # Extract experiment info
-            info = self._get_experiment_info(exp_dir)
-            
-            # If we can't extract info, skip this directory
-            if info is None:
-                continue
-                
-            # Count only experiments from this run
-            if info.get("run_uuid") == run_uuid:
-                total_exps += 1
-                
-                # Check for errors
-                if info.get("err_msg") is not None or info.get("stack_trace") is not None:
-                    exps_with_errors += 1
+        # Count errors among this run's experiments; each record already carries
+        # its summary_info, so there is no need to rescan results_dir
+        total_exps = len(new_records)
+        exps_with_errors = sum(
+            1 for record in new_records
+            if record.get("err_msg") is not None or record.get("stack_trace") is not None
+        )
         
         # Print statistics
-        print("\nRun Statistics:")
-        print(f"  Run UUID: {run_uuid}")
-        print(f"  Total tasks: {len(tasks)}")
-        print(f"  From cache: {cache_hits}")
-        print(f"  Newly executed: {len(tasks_to_run)}")
-        print(f"  Tasks with errors: {exps_with_errors} of {total_exps} ({exps_with_errors/total_exps*100 if total_exps > 0 else 0:.1f}%)")
+        print(
+            "\nRun Statistics:\n"
+            f"  Run UUID: {run_uuid}\n"
+            f"  Total tasks: {len(tasks)}\n"
+            f"  From cache: {cache_hits}\n"
+            f"  Newly executed: {len(tasks_to_run)}\n"
+            f"  Tasks with errors: {exps_with_errors} of {total_exps} ({exps_with_errors/total_exps*100 if total_exps > 0 else 0:.1f}%)"
+        )
         
         return results
     
+    def _order_longest_first(
+        self,
+        tasks: List[str],
+        cache_index: Dict[str, Dict[str, Any]]
+    ) -> List[str]:
+        """
+        Order tasks by the mean past runtime of their task type, longest first.
+        
+        Args:
+            tasks: List of task names to order
+            cache_index: Index from _build_cache_index providing past runtimes
+            
+        Returns:
+            The tasks sorted longest-expected first (task types without history
+            are treated as taking the average time)
+        """
+        type_times = {}
+        for info in cache_index.values():
+            task_name = info.get("task_name")
+            elapsed = (info.get("stats.cum_step_elapsed") or 0) + (info.get("stats.cum_agent_elapsed") or 0)
+            if task_name and elapsed:
+                type_times.setdefault(_extract_task_type(task_name), []).append(elapsed)
+        
+        if not type_times:
+            return tasks
+        
+        type_means = {task_type: mean(times) for task_type, times in type_times.items()}
+        default_time = mean(type_means.values())
+        return sorted(
+            tasks,
+            key=lambda task_name: type_means.get(_extract_task_type(task_name), default_time),
+            reverse=True
+        )
+    
     def _run_single_task(
         self,
         task_name: str,
@@ -757,7 +817,7 @@ class harness:
         max_steps = env_args.max_steps
         
         # Check if this is a leaderboard run
-        is_leaderboard = self.leaderboard if hasattr(self, "leaderboard") else False
+        is_leaderboard = self.leaderboard
         leaderboard_suffix = "_leaderboard" if is_leaderboard else ""
         
         # Create initial summary info with metadata
@@ -772,9 +832,11 @@ class harness:
             "run_uuid": run_uuid,  # Add the run UUID for tracking
         }
         
-        # Write initial summary info
-        with open(summary_info_path, "w") as f:
+        # Write initial summary info via a temp file so cache scans never see a partial file
+        tmp_path = summary_info_path.with_name(summary_info_path.name + ".tmp")
+        with open(tmp_path, "w") as f:
             json.dump(initial_summary, f, indent=4)
+        os.replace(tmp_path, summary_info_path)
         
         # Run the experiment
         exp_args.run()
@@ -809,7 +871,9 @@ class harness:
         task_name: str, 
         agent_args: AbstractAgentArgs, 
         env_args_dict: Dict[str, Any],
-        results_dir: str
+        results_dir: str,
+        cache_index: Optional[Dict[str, Dict[str, Any]]] = None,
+        cache_key_suffix: Optional[str] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Find a cached result for the given task and agent configuration.
@@ -819,41 +883,27 @@ class harness:
             agent_args: Arguments for the agent
             env_args_dict: Dictionary of arguments for the environment
             results_dir: Directory containing experiment results
+            cache_index: Optional index from _build_cache_index; built from results_dir if omitted
+            cache_key_suffix: Optional precomputed _cache_key_suffix for agent_args/env_args_dict
             
         Returns:
             The cached result or None if not found or if the result contains errors
         """
         # Create cache key
-        cache_key = self._create_cache_key(task_name, agent_args, env_args_dict)
+        if cache_key_suffix is None:
+            cache_key_suffix = self._cache_key_suffix(agent_args, env_args_dict)
+        cache_key = f"{task_name}{cache_key_suffix}"
         
-        # Find all experiment directories
-        exp_dirs = self._find_experiment_dirs(results_dir)
+        if cache_index is None:
+            cache_index = self._build_cache_index(results_dir)
         
-        # Filter by cache key
-        matching_exps = []
-        
-        for exp_dir in exp_dirs:
-            # Extract experiment info
-            info = self._get_experiment_info(exp_dir)
-            
-            # If we can't extract info, skip this directory
-            if info is None:
-                continue
-            
-            # Check if this experiment matches our cache key
-            if info.get("cache_key") == cache_key:
-                matching_exps.append(info)
+        # Get the most recent experiment for this cache key
+        result = cache_index.get(cache_key)
         
         # If no matching experiments, return None
-        if not matching_exps:
+        if result is None:
             return None
         
-        # Sort by timestamp (newest first)
-        matching_exps.sort(key=lambda x: x.get("timestamp", 0), reverse=True)
-        
-        # Get the most recent experiment
-        result = matching_exps[0]
-        
         # Check if the result has errors
         has_error = (result.get("err_msg") is not None or 
                     result.get("stack_trace") is not None)
@@ -865,6 +915,39 @@ class harness:
             
         return result
     
+    def _build_cache_index(self, results_dir: str) -> Dict[str, Dict[str, Any]]:
+        """
+        Index the experiments in the results directory by cache key.
+        
+        Args:
+            results_dir: Directory containing experiment results
+            
+        Returns:
+            Dictionary mapping each cache key to the info of its most recent experiment
+        """
+        cache_index = {}
+        exp_dirs = self._find_experiment_dirs(results_dir)
+        if not exp_dirs:
+            return cache_index
+        
+        # Reading summary files is I/O bound, so load them on a thread pool;
+        # map() keeps directory order, which the tie-break below relies on
+        with ThreadPoolExecutor(max_workers=min(32, len(exp_dirs))) as pool:
+            infos = list(pool.map(self._get_experiment_info, exp_dirs))
+        
+        for info in infos:
+            # If we can't extract info, skip this directory
+            if info is None:
+                continue
+            
+            # Keep the newest experiment per key (the first one seen wins ties)
+            cache_key = info.get("cache_key")
+            current = cache_index.get(cache_key)
+            if current is None or info.get("timestamp", 0) > current.get("timestamp", 0):
+                cache_index[cache_key] = info
+        
+        return cache_index
+    
     def _create_cache_key(
         self, 
         task_name: str, 
@@ -882,6 +965,23 @@ class harness:
         Returns:
             A string key for the cache
         """
+        return f"{task_name}{self._cache_key_suffix(agent_args, env_args_dict)}"
+    
+    def _cache_key_suffix(
+        self, 
+        agent_args: AbstractAgentArgs, 
+        env_args_dict: Dict[str, Any]
+    ) -> str:
+        """
+        Build the task-independent part of the cache key.
+        
+        Args:
+            agent_args: Arguments for the agent
+            env_args_dict: Dictionary of arguments for the environment
+            
+        Returns:
+            The suffix appended to the task name to form the cache key
+        """
         # Extract core agent info for the cache key
         agent_model = getattr(agent_args, "model_name", "unknown")
         agent_type = agent_args.agent_name if hasattr(agent_args, "agent_name") else type(agent_args).__name__
@@ -890,13 +990,11 @@ class harness:
         max_steps = env_args_dict.get("max_steps", "default")
         
         # Check if this is a leaderboard run
-        is_leaderboard = self.leaderboard if hasattr(self, "leaderboard") else False
+        is_leaderboard = self.leaderboard
         leaderboard_suffix = "_leaderboard" if is_leaderboard else ""
         
-        # Create a reproducible cache key with leaderboard flag
-        cache_key = f"{task_name}_{agent_type}_{agent_model}_{max_steps}{leaderboard_suffix}"
-        
-        return cache_key
+        # Create a reproducible cache key suffix with leaderboard flag
+        return f"_{agent_type}_{agent_model}_{max_steps}{leaderboard_suffix}"
     
     def _find_experiment_dirs(self, results_dir: str) -> List[Path]:
         """
@@ -908,18 +1006,16 @@ class harness:
         Returns:
             List of experiment directory paths
         """
-        results_path = Path(results_dir)
-        
         # Experiment directories are identified by the presence of summary_info.json
         exp_dirs = []
         
         # Walk through all directories in results_dir
         for root, dirs, files in os.walk(results_dir):
-            root_path = Path(root)
-            
             # Check if this directory has the required files to be an experiment directory
             if "summary_info.json" in files:
-                exp_dirs.append(root_path)
+                exp_dirs.append(Path(root))
+                # Experiment directories don't nest, so skip their step files and subdirectories
+                dirs.clear()
         
         return exp_dirs
     